@@ -2,7 +2,7 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.viewsets import ViewSet
-from django.conf import settings
+from django.core.cache import cache
 from django.contrib.auth.models import User
 from api.models import (
     Destination, EmergencyInfo, MetadataTag,
@@ -10,9 +10,10 @@ from api.models import (
 )
 from rest_framework.decorators import authentication_classes, permission_classes
 from api.auth import JWTAuthentication
-from api.permissions import IsAdmin, IsUser, IsAdminOrUser
-from collections import Counter
+from api.permissions import IsAdmin
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from bson import ObjectId
 
 
 
@@ -21,26 +22,29 @@ from datetime import datetime, timedelta
 @permission_classes([IsAdmin])
 class DestinationAdminView(ViewSet):
     def list(self, request):
-        destinations = Destination.objects.all()
-        data = [{"id": str(dest.id), "name": dest.name, "approved": dest.approved} for dest in destinations]
+        destinations = Destination.objects.only("id", "name", "approved").as_pymongo()
+        data = [{"id": str(d["_id"]), "name": d.get("name"), "approved": d.get("approved", False)} for d in destinations]
         return Response(data)
 
     def update(self, request, pk=None):
-        try:
-            destination = Destination.objects.get(id=pk)
-            destination.approved = request.data.get("approved", destination.approved)
-            destination.save()
-            return Response({"message": "Destination status updated"})
-        except Destination.DoesNotExist:
+        if not ObjectId.is_valid(pk):
+            return Response({"message": "Destination not found"}, status=status.HTTP_404_NOT_FOUND)
+
+        destinations = Destination.objects(id=pk)
+        if "approved" in request.data:
+            # Single UPDATE instead of loading and re-saving the document
+            found = destinations.update_one(set__approved=request.data["approved"])
+        else:
+            found = destinations.only("id").first() is not None
+        if not found:
             return Response({"message": "Destination not found"}, status=status.HTTP_404_NOT_FOUND)
+        return Response({"message": "Destination status updated"})
 
     def destroy(self, request, pk=None):
-        try:
-            destination = Destination.objects.get(id=pk)
-            destination.delete()
-            return Response({"message": "Destination deleted"})
-        except Destination.DoesNotExist:
+        deleted = Destination.objects(id=pk).delete() if ObjectId.is_valid(pk) else 0
+        if not deleted:
             return Response({"message": "Destination not found"}, status=status.HTTP_404_NOT_FOUND)
+        return Response({"message": "Destination deleted"})
 
 
 
@@ -49,8 +53,8 @@ class DestinationAdminView(ViewSet):
 @permission_classes([IsAdmin])
 class EmergencyInfoView(ViewSet):
     def list(self, request):
-        infos = EmergencyInfo.objects.all()
-        data = [{"id": str(i.id), "location": i.location, "hospital": i.hospital, "police": i.police, "helpline": i.helpline} for i in infos]
+        infos = EmergencyInfo.objects.only("id", "location", "hospital", "police", "helpline").as_pymongo()
+        data = [{"id": str(i["_id"]), "location": i.get("location"), "hospital": i.get("hospital"), "police": i.get("police"), "helpline": i.get("helpline")} for i in infos]
         return Response(data)
 
     def create(self, request):
@@ -64,8 +68,8 @@ class EmergencyInfoView(ViewSet):
 @permission_classes([IsAdmin])
 class MetadataTagView(ViewSet):
     def list(self, request):
-        tags = MetadataTag.objects.all()
-        data = [{"id": str(t.id), "poi_id": t.poi_id, "tag": t.tag} for t in tags]
+        tags = MetadataTag.objects.only("id", "poi_id", "tag").as_pymongo()
+        data = [{"id": str(t["_id"]), "poi_id": t.get("poi_id"), "tag": t.get("tag")} for t in tags]
         return Response(data)
 
     def create(self, request):
@@ -79,28 +83,33 @@ class MetadataTagView(ViewSet):
 @permission_classes([IsAdmin])
 class AdminUserView(APIView):
     def get(self, request):
-        users = UserProfile.objects.all()
+        users = UserProfile.objects.only(
+            "id", "user_id", "first_name", "last_name", "dob", "gender",
+            "contact_number", "email", "location", "is_approved", "profile_image_id"
+        ).as_pymongo()
         data = []
 
+        # Resolve the absolute URL prefix once rather than per user
+        image_url_prefix = request.build_absolute_uri("/api/user/")
+
         for u in users:
             # Build image URL if available
             image_url = None
-            if u.profile_image_id:
-                image_url = request.build_absolute_uri(
-                    f"/api/user/{u.id}/profile-picture/"
-                )
+            if u.get("profile_image_id"):
+                image_url = f"{image_url_prefix}{u['_id']}/profile-picture/"
 
+            dob = u.get("dob")
             data.append({
-                "id": str(u.id),
-                "user_id": u.user_id,
-                "first_name": u.first_name,
-                "last_name": u.last_name,
-                "dob": u.dob,
-                "gender": u.gender,
-                "contact_number": u.contact_number,
-                "email": u.email,
-                "location": u.location,
-                "is_approved": u.is_approved,
+                "id": str(u["_id"]),
+                "user_id": u.get("user_id"),
+                "first_name": u.get("first_name"),
+                "last_name": u.get("last_name"),
+                "dob": dob.date() if dob else None,  # DateField is stored as a datetime
+                "gender": u.get("gender"),
+                "contact_number": u.get("contact_number"),
+                "email": u.get("email"),
+                "location": u.get("location"),
+                "is_approved": u.get("is_approved", False),
                 "profile_image": image_url,   # add image URL here
             })
 
@@ -114,80 +123,96 @@ class AdminUserView(APIView):
 @permission_classes([IsAdmin])
 class AdminComplaintView(APIView):
     def get(self, request):
-        complaints = Complaint.objects.all().order_by('-id')
+        complaints = Complaint.objects.only(
+            "id", "user_id", "subject", "message", "reply", "created_at"
+        ).order_by('-created_at').as_pymongo()
         data = []
         for c in complaints:
             data.append({
-                "id": str(c.id),
-                "user_id": c.user_id,
-                "subject": c.subject,
-                "message": c.message,
-                "reply": c.reply,
-                "created_at": c.created_at.isoformat() if hasattr(c, 'created_at') and c.created_at else None,
-                "has_reply": bool(c.reply)
+                "id": str(c["_id"]),
+                "user_id": c.get("user_id"),
+                "subject": c.get("subject"),
+                "message": c.get("message"),
+                "reply": c.get("reply", ""),
+                "created_at": c["created_at"].isoformat() if c.get("created_at") else None,
+                "has_reply": bool(c.get("reply"))
             })
         return Response(data)
 
     def post(self, request):
-        try:
-            from bson import ObjectId
-            complaint = Complaint.objects(id=ObjectId(request.data["complaint_id"])).first()
-            if not complaint:
-                return Response({"message": "Complaint not found"}, status=404)
-                
-            complaint.reply = request.data["reply"]
-            complaint.save()  # This will update the updated_at field
-            return Response({"message": "Reply sent to user"})
-        except Exception as e:
+        complaint_id = request.data.get("complaint_id")
+        reply = request.data.get("reply")
+        if reply is None or not ObjectId.is_valid(complaint_id):
             return Response({"message": "Invalid complaint ID or server error"}, status=400)
 
+        # Single UPDATE; updated_at is stamped by the server via $currentDate
+        result = Complaint._get_collection().update_one(
+            {"_id": ObjectId(complaint_id)},
+            {"$set": {"reply": reply}, "$currentDate": {"updated_at": True}}
+        )
+        if not result.matched_count:
+            return Response({"message": "Complaint not found"}, status=404)
+        return Response({"message": "Reply sent to user"})
+
 
 #Admin analytics
 @authentication_classes([JWTAuthentication])
 @permission_classes([IsAdmin])
 class AdminAnalyticsView(APIView):
+    CACHE_KEY = "admin:analytics"
+    CACHE_TIMEOUT = 60  # seconds
+
     def get(self, request):
+        # Analytics change slowly, so recompute at most once per CACHE_TIMEOUT
+        return Response(cache.get_or_set(self.CACHE_KEY, self.compute_analytics, self.CACHE_TIMEOUT))
+
+    def compute_analytics(self):
         # Total users
         user_count = User.objects.count()
 
         # Total trips
         trip_count = UserItinerary.objects.count()
 
+        one_month_ago = datetime.now().date() - timedelta(days=30)
+        collection = UserItinerary._get_collection()
+
         # Top destinations
-        destinations = [
-            t.itinerary_data.get("summary", {}).get("destination", "Unknown")
-            for t in UserItinerary.objects
-            if t.itinerary_data.get("summary", {}).get("destination", None)
+        top_destinations_pipeline = [
+            {"$match": {"itinerary_data.summary.destination": {"$nin": [None, ""]}}},
+            {"$group": {"_id": "$itinerary_data.summary.destination", "trips": {"$sum": 1}}},
+            {"$sort": {"trips": -1}},
+            {"$limit": 5},
+            {"$project": {"_id": 0, "destination": "$_id", "trips": 1}},
         ]
-        dest_counter = Counter(destinations)
-        top_destinations = sorted(
-            [{"destination": dest, "trips": count} for dest, count in dest_counter.items()],
-            key=lambda x: x["trips"],
-            reverse=True
-        )[:5]
-
-        # Trips in last 30 days
-        one_month_ago = datetime.now().date() - timedelta(days=30)
-        recent_trips = [
-            t for t in UserItinerary.objects
-            if datetime.strptime(t.itinerary_data.get("summary", {}).get("start_date", "1900-01-01"), "%Y-%m-%d").date() >= one_month_ago
+
+        # Trips in last 30 days (start_date is stored as a YYYY-MM-DD string)
+        recent_trips_pipeline = [
+            {"$match": {"itinerary_data.summary.start_date": {"$gte": one_month_ago.isoformat()}}},
+            {"$count": "trips"},
         ]
 
         # Top users by number of trips
-        user_trips_counter = Counter([t.user_id for t in UserItinerary.objects])
-        top_users_by_trips = sorted(
-            [{"user_id": uid, "no_of_trips": count} for uid, count in user_trips_counter.items()],
-            key=lambda x: x["no_of_trips"],
-            reverse=True
-        )[:5]
-
-        return Response({
+        top_users_pipeline = [
+            {"$group": {"_id": "$user_id", "no_of_trips": {"$sum": 1}}},
+            {"$sort": {"no_of_trips": -1}},
+            {"$limit": 5},
+            {"$project": {"_id": 0, "user_id": "$_id", "no_of_trips": 1}},
+        ]
+
+        # The three pipelines are independent, so run them concurrently
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            top_destinations, recent_trips, top_users_by_trips = executor.map(
+                lambda pipeline: list(collection.aggregate(pipeline)),
+                [top_destinations_pipeline, recent_trips_pipeline, top_users_pipeline]
+            )
+
+        return {
             "total_users": user_count,
             "total_trips": trip_count,
             "top_destinations": top_destinations,
-            "trips_last_30_days": len(recent_trips),
+            "trips_last_30_days": recent_trips[0]["trips"] if recent_trips else 0,
             "top_users_by_trips": top_users_by_trips
-        })
+        }
 
 # Approve or reject user-suggested destinations
 @authentication_classes([JWTAuthentication])
@@ -198,27 +223,43 @@ class DestinationSuggestionAdminView(ViewSet):
         data = [{"id": str(s.id), "name": s.name, "description": s.description, "coordinates": s.coordinates} for s in suggestions]
         return Response(data)
 
+    @staticmethod
+    def _to_destination(suggestion):
+        location = suggestion.location
+        return Destination(
+            name=suggestion.name,
+            coordinates=f"{location.lat},{location.lng}" if location else None,
+            approved=True
+        )
+
     def approve(self, request, pk=None):
         try:
             suggestion = DestinationSuggestion.objects.get(id=pk)
             # Create Destination
-            dest = Destination(
-                name=suggestion.name,
-                description=suggestion.description,
-                coordinates=suggestion.coordinates,
-                approved=True
-            )
+            dest = self._to_destination(suggestion)
             dest.save()
             suggestion.delete()
             return Response({"message": "Destination approved and added to main list"})
         except DestinationSuggestion.DoesNotExist:
             return Response({"message": "Suggestion not found"}, status=404)
 
+    def approve_many(self, request):
+        ids = request.data.get("ids", []) if isinstance(request.data, dict) else None
+        if not isinstance(ids, list) or not all(isinstance(i, str) for i in ids):
+            return Response({"message": "ids must be a list of suggestion id strings"}, status=400)
+        ids = [i for i in ids if ObjectId.is_valid(i)]
+        suggestions = list(DestinationSuggestion.objects(id__in=ids).only("id", "name", "location"))
+        if not suggestions:
+            return Response({"message": "Suggestion not found"}, status=404)
+
+        # One batched insert and one delete, regardless of how many are approved
+        Destination.objects.insert([self._to_destination(s) for s in suggestions])
+        DestinationSuggestion.objects(id__in=[s.id for s in suggestions]).delete()
+        return Response({"message": f"{len(suggestions)} destinations approved and added to main list"})
+
     def destroy(self, request, pk=None):
-        try:
-            suggestion = DestinationSuggestion.objects.get(id=pk)
-            suggestion.delete()
-            return Response({"message": "Suggestion deleted"})
-        except DestinationSuggestion.DoesNotExist:
+        deleted = DestinationSuggestion.objects(id=pk).delete() if ObjectId.is_valid(pk) else 0
+        if not deleted:
             return Response({"message": "Suggestion not found"}, status=404)
+        return Response({"message": "Suggestion deleted"})
 
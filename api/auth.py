@@ -1,10 +1,22 @@
 # api/auth.py
+import hashlib
+import time
 import jwt
 from django.conf import settings
+from django.core.cache import cache
 from rest_framework.authentication import BaseAuthentication
 from rest_framework.exceptions import AuthenticationFailed
 from django.contrib.auth.models import User
 
+# Resolved once at import instead of on every request
+_JWT_SECRET = settings.JWT_SECRET
+_JWT_ALGORITHMS = (settings.JWT_ALGORITHM,)
+_JWT_DECODE_OPTIONS = {"require": ["exp"]}
+
+# Upper bound on how long a verified token is reused, so a deleted or
+# deactivated user stops authenticating within minutes, not at token expiry
+JWT_CACHE_MAX_TIMEOUT = 300  # seconds
+
 
 class JWTAuthentication(BaseAuthentication):
     def authenticate(self, request):
@@ -15,21 +27,36 @@ class JWTAuthentication(BaseAuthentication):
 
         token = auth_header.split(" ")[1]
 
+        # Tokens that were already verified are cached until they expire (capped)
+        cache_key = "jwt:" + hashlib.sha256(token.encode()).hexdigest()
+        cached = cache.get(cache_key)
+        if cached is not None:
+            request._is_admin = cached[1].get("role") == "admin"
+            return cached
+
         try:
-            payload = jwt.decode(token, settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM])
+            payload = jwt.decode(token, _JWT_SECRET, algorithms=_JWT_ALGORITHMS, options=_JWT_DECODE_OPTIONS)
         except jwt.ExpiredSignatureError:
             raise AuthenticationFailed("Token has expired")
         except jwt.InvalidTokenError:
             raise AuthenticationFailed("Invalid token")
 
-        # Admin doesn’t exist in User table, so return None but pass payload
-        if payload.get("role") == "admin":
-            return (None, payload)
+        # Decide admin once here so IsAdmin is a plain attribute read
+        request._is_admin = payload.get("role") == "admin"
 
-        # Normal user → fetch from DB
-        try:
-            user = User.objects.get(id=payload["user_id"])
-        except User.DoesNotExist:
-            raise AuthenticationFailed("User not found")
-
-        return (user, payload)
+        # Admin doesn’t exist in User table, so return None but pass payload
+        if request._is_admin:
+            result = (None, payload)
+        else:
+            # Normal user → fetch from DB
+            try:
+                user = User.objects.only("id", "username", "password", "is_active").get(id=payload["user_id"])
+            except User.DoesNotExist:
+                raise AuthenticationFailed("User not found")
+            result = (user, payload)
+
+        timeout = min(int(payload.get("exp", 0)) - int(time.time()), JWT_CACHE_MAX_TIMEOUT)
+        if timeout > 0:
+            cache.set(cache_key, result, timeout=timeout)
+
+        return result
@@ -6,12 +6,14 @@ class Command(BaseCommand):
     help = "Clean up Django users that do not have a corresponding UserProfile in MongoDB"
 
     def handle(self, *args, **kwargs):
-        deleted_count = 0
-        for user in User.objects.all():
-            if not UserProfile.objects.filter(user_id=str(user.id)).first():
-                self.stdout.write(self.style.WARNING(f"Deleting: {user.username} (id={user.id})"))
-                user.delete()
-                deleted_count += 1
+        # Fetch every known profile user_id in one query instead of one per user
+        known_ids = [int(uid) for uid in UserProfile.objects.distinct("user_id") if uid and uid.isdigit()]
+        dangling = User.objects.exclude(id__in=known_ids)
+
+        deleted_count = dangling.count()
+        if deleted_count:
+            self.stdout.write(self.style.WARNING(f"Deleting {deleted_count} users without a UserProfile"))
+            dangling.delete()
 
         if deleted_count == 0:
             self.stdout.write(self.style.SUCCESS("✅ No dangling users found."))
@@ -0,0 +1,57 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from mongoengine.connection import get_db
+from api.models import UserProfile
+
+
+class Command(BaseCommand):
+    help = (
+        "Build the UserProfile indexes, replacing the old non-unique email index with "
+        "the unique one and removing duplicate-email profiles first. Run once per database"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run", action="store_true",
+            help="Report duplicates and the index change without writing anything"
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options["dry_run"]
+        # UserProfile has auto_create_index off, so its indexes are only built here
+        collection = get_db()[UserProfile._meta["collection"]]
+
+        # 1. Dedup: per email keep the profile owned by the Django user with that
+        # username, otherwise the oldest one, and delete the rest
+        removed = 0
+        for group in collection.aggregate([
+            {"$group": {"_id": "$email", "ids": {"$push": "$_id"}, "user_ids": {"$push": "$user_id"}, "count": {"$sum": 1}}},
+            {"$match": {"count": {"$gt": 1}}},
+        ]):
+            owner = User.objects.filter(username=group["_id"]).values_list("id", flat=True).first()
+            profiles = sorted(zip(group["ids"], group["user_ids"]))
+            keep = next((pid for pid, uid in profiles if owner is not None and uid == str(owner)), profiles[0][0])
+            drop = [pid for pid, _ in profiles if pid != keep]
+            self.stdout.write(self.style.WARNING(
+                f"{group['_id']}: keeping profile {keep}, removing {len(drop)} duplicate(s)"
+            ))
+            if not dry_run:
+                removed += collection.delete_many({"_id": {"$in": drop}}).deleted_count
+
+        # 2. Drop any email index that isn't unique; MongoDB refuses a second index
+        # on the same key with different options, whatever its name
+        for name, info in collection.index_information().items():
+            if info["key"] == [("email", 1)] and not info.get("unique"):
+                self.stdout.write(f"Dropping non-unique index {name}")
+                if not dry_run:
+                    collection.drop_index(name)
+
+        if dry_run:
+            self.stdout.write(self.style.SUCCESS("Dry run: nothing written."))
+            return
+
+        # 3. Build the indexes declared on UserProfile, including the unique email one
+        UserProfile.ensure_indexes()
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Removed {removed} duplicate profiles; unique email index in place."
+        ))
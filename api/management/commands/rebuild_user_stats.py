@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand
+from pymongo import UpdateOne
+from api.models import UserProfile, UserItinerary, Complaint
+
+BATCH_SIZE = 1000
+
+class Command(BaseCommand):
+    help = "Recompute the dashboard counters stored on every UserProfile from the source collections"
+
+    def handle(self, *args, **kwargs):
+        # One $group per collection instead of per-user count/average queries
+        trips = {
+            row["_id"]: row
+            for row in UserItinerary._get_collection().aggregate([
+                {"$group": {
+                    "_id": "$user_id",
+                    "count": {"$sum": 1},
+                    "budget_sum": {"$sum": "$itinerary_data.summary.actual_cost"}
+                }}
+            ])
+        }
+        complaints = {
+            row["_id"]: row["count"]
+            for row in Complaint._get_collection().aggregate([
+                {"$group": {"_id": "$user_id", "count": {"$sum": 1}}}
+            ])
+        }
+
+        collection = UserProfile._get_collection()
+        ops = []
+        updated = 0
+        for profile in collection.find({}, {"user_id": 1}):
+            user_trips = trips.get(profile.get("user_id"), {})
+            ops.append(UpdateOne({"_id": profile["_id"]}, {"$set": {
+                "trip_count": user_trips.get("count", 0),
+                "trip_budget_sum": user_trips.get("budget_sum", 0),
+                "complaint_count": complaints.get(profile.get("user_id"), 0)
+            }}))
+            if len(ops) == BATCH_SIZE:
+                updated += collection.bulk_write(ops, ordered=False).matched_count
+                ops = []
+        if ops:
+            updated += collection.bulk_write(ops, ordered=False).matched_count
+
+        self.stdout.write(self.style.SUCCESS(f"✅ Rebuilt dashboard counters for {updated} profiles."))
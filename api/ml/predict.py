@@ -2,10 +2,105 @@
 import joblib
 import os
 import pandas as pd
+from functools import lru_cache
+from sklearn.preprocessing import FunctionTransformer, OneHotEncoder
 
 MODEL_PATH = os.path.join(os.path.dirname(__file__), "../../tripwise_budget_model.pkl")
-model = joblib.load(MODEL_PATH)
+
+# Column order the pipeline was trained with (see train_model.py)
+FEATURE_ORDER = ["destination", "duration", "travel_type", "interest"]
+
+
+@lru_cache(maxsize=None)
+def get_model():
+    return joblib.load(MODEL_PATH)
+
+
+def _is_passthrough(transformer):
+    # Newer scikit-learn stores a passthrough remainder as an identity FunctionTransformer
+    return (isinstance(transformer, str) and transformer == "passthrough") or (
+        isinstance(transformer, FunctionTransformer) and transformer.func is None
+    )
+
+
+def _is_plain_one_hot(transformer):
+    # Only this configuration encodes a known category as a single 1 and an
+    # unknown one as all zeros, which is what the compiled weights assume
+    return (
+        isinstance(transformer, OneHotEncoder)
+        and transformer.handle_unknown == "ignore"
+        and transformer.drop is None
+        and getattr(transformer, "min_frequency", None) is None
+        and getattr(transformer, "max_categories", None) is None
+    )
+
+
+def _compile_linear_model(model):
+    """
+    Flatten the OneHotEncoder + LinearRegression pipeline into an intercept and
+    per-feature weights, so a prediction is a handful of dict lookups.
+    Returns None if the pipeline doesn't have the expected shape or encoder
+    settings, in which case predictions go through the pipeline itself.
+    """
+    try:
+        preprocessor = model.named_steps["preprocessor"]
+        regressor = model.named_steps["regressor"]
+        coef = [float(c) for c in regressor.coef_]
+
+        weights = {}
+        offset = 0
+        for name, transformer, columns in preprocessor.transformers_:
+            if name == "cat":
+                if not _is_plain_one_hot(transformer):
+                    return None
+                # One weight per known category; unknown categories encode to all zeros
+                for column, categories in zip(columns, transformer.categories_):
+                    weights[column] = {cat: coef[offset + i] for i, cat in enumerate(categories)}
+                    offset += len(categories)
+            elif name == "remainder" and _is_passthrough(transformer):
+                for column in columns:
+                    column = FEATURE_ORDER[column] if isinstance(column, int) else column
+                    weights[column] = coef[offset]
+                    offset += 1
+            elif not (isinstance(transformer, str) and transformer == "drop"):
+                # Any other transformer changes the features; leave it to the pipeline
+                return None
+
+        if offset != len(coef):
+            return None
+        return float(regressor.intercept_), weights
+    except (AttributeError, KeyError, TypeError, IndexError):
+        return None
+
+
+@lru_cache(maxsize=None)
+def get_compiled_model():
+    return _compile_linear_model(get_model())
+
 
 def predict_budget(input_data):
-    df = pd.DataFrame([input_data])
-    return int(model.predict(df)[0])
+    compiled = get_compiled_model()
+    if compiled is not None:
+        intercept, weights = compiled
+        # Summed in feature order before adding the intercept, like X @ coef + b
+        total = 0.0
+        for column, weight in weights.items():
+            value = input_data[column]
+            total += weight.get(value, 0.0) if isinstance(weight, dict) else weight * value
+        return int(total + intercept)
+
+    # The ColumnTransformer selects the categorical columns by name, so the
+    # frame is built directly from a single row in training column order
+    df = pd.DataFrame([[input_data[k] for k in FEATURE_ORDER]], columns=FEATURE_ORDER)
+    return int(get_model().predict(df)[0])
+
+
+@lru_cache(maxsize=4096)
+def predict_budget_cached(destination, duration, travel_type, interest):
+    """predict_budget keyed on the four feature values, so repeat requests skip inference."""
+    return predict_budget({
+        "destination": destination,
+        "duration": duration,
+        "travel_type": travel_type,
+        "interest": interest
+    })
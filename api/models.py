@@ -1,6 +1,6 @@
 # api/models.py
 
-from mongoengine import Document, StringField, BooleanField, DateField, FloatField, ListField, DictField, DateTimeField, EmbeddedDocument, EmbeddedDocumentField
+from mongoengine import Document, StringField, BooleanField, DateField, FloatField, IntField, ListField, DictField, DateTimeField, EmbeddedDocument, EmbeddedDocumentField
 from datetime import datetime, timezone
 
 class Destination(Document):
@@ -20,7 +20,10 @@ class EmergencyInfo(Document):
 class MetadataTag(Document):
     poi_id = StringField(required=True)
     tag = StringField(required=True)
-    meta = {'collection': 'metadata_tag'}
+    meta = {
+        'collection': 'metadata_tag',
+        'indexes': ['poi_id']
+    }
 
 class UserProfile(Document):
     user_id = StringField(required=True)  # Django User.id or uuid
@@ -34,9 +37,19 @@ class UserProfile(Document):
     profile_image_id = StringField()  
     is_approved = BooleanField(default=False)
     role = StringField(choices=["admin", "user"], default="user")  # optional
+    # Dashboard counters, kept in step on write so DashboardStats is a single lookup
+    trip_count = IntField(default=0)
+    trip_budget_sum = FloatField(default=0)
+    complaint_count = IntField(default=0)
     meta = {
         'collection': 'user_profile',
-        'indexes': ['email']  # faster lookup
+        # Built by 'manage.py migrate_unique_email', not on first use: deployed
+        # databases hold a non-unique email_1 index that conflicts with the unique one
+        'auto_create_index': False,
+        'indexes': [
+            {'fields': ['email'], 'unique': True},  # faster lookup, rejects duplicates
+            'user_id'  # login, dashboard and profile-picture lookups
+        ]
     }
 
 
@@ -45,7 +58,10 @@ class TripLog(Document):
     destination = StringField()
     budget = FloatField()
     date = DateField(default=None)
-    meta = {'collection': 'trip_log'}
+    meta = {
+        'collection': 'trip_log',
+        'indexes': [('user_id', '-date')]
+    }
 
 
 class Location(EmbeddedDocument):
@@ -62,7 +78,10 @@ class DestinationSuggestion(Document):
     type = StringField()
     location = EmbeddedDocumentField(Location)   # instead of coordinates string
 
-    meta = {'collection': 'destination_suggestion'}
+    meta = {
+        'collection': 'destination_suggestion',
+        'indexes': ['user_id']
+    }
 
 class Complaint(Document):
     user_id = StringField()
@@ -72,13 +91,13 @@ class Complaint(Document):
     created_at = DateTimeField(default=datetime.utcnow)
     updated_at = DateTimeField(default=datetime.utcnow)
     
-    meta = {'collection': 'complaint'}
-    
-    def save(self, *args, **kwargs):
-        if not self.created_at:
-            self.created_at = datetime.utcnow()
-        self.updated_at = datetime.utcnow()
-        return super(Complaint, self).save(*args, **kwargs)
+    meta = {
+        'collection': 'complaint',
+        'indexes': [
+            ('user_id', '-id'),  # a user's complaints, newest first
+            '-created_at'  # admin complaint list ordering
+        ]
+    }
 
 class TripReview(Document):
     user_id = StringField()
@@ -90,7 +109,10 @@ class TripReview(Document):
     start_date = DateTimeField()  # New field
     end_date = DateTimeField()  # New field
     created_at = DateTimeField(default=datetime.utcnow)
-    meta = {'collection': 'trip_review'}
+    meta = {
+        'collection': 'trip_review',
+        'indexes': ['user_id']
+    }
 
 
 class PointOfInterest(Document):
@@ -102,11 +124,21 @@ class PointOfInterest(Document):
     estimated_cost = FloatField()
     hidden = BooleanField(default=False)
     tags = ListField(StringField())
-    meta = {'collection': 'point_of_interest'}
+    meta = {
+        'collection': 'point_of_interest',
+        'indexes': [('destination', 'tags')]  # hidden spot lookups
+    }
 
 class UserItinerary(Document):
     user_id = StringField(required=True)
     itinerary_data = DictField(required=True)  # stores the full response JSON
     created_at = DateTimeField(default=lambda: datetime.now(timezone.utc))
 
-    meta = {"collection": "user_itineraries"}
\ No newline at end of file
+    meta = {
+        "collection": "user_itineraries",
+        "indexes": [
+            ("user_id", "-created_at"),  # a user's trips, newest first
+            "itinerary_data.summary.start_date",
+            "itinerary_data.summary.destination",
+        ]
+    }
\ No newline at end of file
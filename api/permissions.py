@@ -2,19 +2,23 @@
 from rest_framework.permissions import BasePermission
 
 
-class IsAdmin(BasePermission):
-    def has_permission(self, request, view):
-        payload = request.auth  # we passed payload as "auth" in authenticate()
-        return payload and payload.get("role") == "admin"
-
+class _HasRole(BasePermission):
+    roles = frozenset()
 
-class IsUser(BasePermission):
     def has_permission(self, request, view):
         payload = request.auth
-        return payload and payload.get("role") == "user"
+        return payload is not None and payload.get("role") in self.roles
 
 
-class IsAdminOrUser(BasePermission):
+class IsAdmin(BasePermission):
     def has_permission(self, request, view):
-        payload = request.auth
-        return payload and payload.get("role") in ["admin", "user"]
+        # set by JWTAuthentication.authenticate() from the token payload
+        return getattr(request, "_is_admin", False)
+
+
+class IsUser(_HasRole):
+    roles = frozenset({"user"})
+
+
+class IsAdminOrUser(_HasRole):
+    roles = frozenset({"admin", "user"})
@@ -18,6 +18,7 @@ urlpatterns = [
     path("admin/complaints/", AdminComplaintView.as_view()),
     path("admin/analytics/", AdminAnalyticsView.as_view()),
     path("admin/suggestions/", DestinationSuggestionAdminView.as_view({"get": "list", "delete": "destroy"})),
+    path("admin/suggestions/approve/", DestinationSuggestionAdminView.as_view({"post": "approve_many"})),
     # Admin fetches any user's picture by id
     path("user/<str:user_id>/profile-picture/", UserProfilePictureView.as_view(), name="user-profile-picture"),
 
@@ -1,13 +1,15 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from django.db import transaction
+from django.db import IntegrityError, transaction
 from django.core.exceptions import ValidationError
 from django.core.validators import validate_email
-import re
+import hashlib
+import hmac
+import string
 import jwt
-import os
 from django.conf import settings
+from django.core.cache import cache
 from django.contrib.auth.models import User
 from django.contrib.auth import authenticate
 from api.models import (
@@ -18,15 +20,95 @@ from rest_framework.decorators import authentication_classes, permission_classes
 from api.auth import JWTAuthentication
 from api.permissions import IsAdmin, IsUser, IsAdminOrUser
 import gridfs
-from pymongo import MongoClient
-from django.http import HttpResponse
+from mongoengine.connection import get_connection
+from pymongo.errors import DuplicateKeyError
+from django.http import HttpResponseNotModified, JsonResponse, StreamingHttpResponse
+from django.utils.http import parse_etags
 from bson import ObjectId
+from functools import lru_cache
 import uuid
 
+# Registration form fields, in the order RegisterUser.post unpacks them
+_REGISTER_FIELDS = ("email", "password", "first_name", "last_name", "dob", "location", "contact_number", "gender")
+
+# Registration character classes, built once at import
+_PASSWORD_LETTERS = frozenset(string.ascii_letters)
+_LAST_NAME_CHARS = _PASSWORD_LETTERS | {" "}
+_PASSWORD_SPECIALS = frozenset('!@#$%^&*(),.?":{}|<>')
+
+MAX_IMAGE_SIZE_MB = 5  # Maximum allowed size in MB
+MAX_IMAGE_SIZE_BYTES = MAX_IMAGE_SIZE_MB * 1024 * 1024
+# Image plus the text fields and multipart framing
+MAX_REGISTER_BODY_SIZE = (MAX_IMAGE_SIZE_MB + 1) * 1024 * 1024
+
+# Allowed MIME types, lowercase
+ALLOWED_IMAGE_TYPES = frozenset({"image/jpeg", "image/jpg", "image/png", "image/pjpeg", "image/x-png"})
+
+# Leading bytes of JPEG and PNG files
+_IMAGE_SIGNATURES = (b"\xff\xd8\xff", b"\x89PNG\r\n\x1a\n")
+
+
+# Login settings, resolved once at import instead of on every request
+_JWT_SECRET = settings.JWT_SECRET
+_JWT_ALGORITHM = settings.JWT_ALGORITHM
+_JWT_EXP_DELTA = timedelta(seconds=settings.JWT_EXP_DELTA)
+_ADMIN_USERNAME = (settings.ADMIN_USERNAME or "").encode()
+_ADMIN_PASSWORD = (settings.ADMIN_PASSWORD or "").encode()
+
+def _check_admin_login(username, password):
+    """None if the username isn't the admin's, else whether the admin password matches.
+
+    Both comparisons are constant-time.
+    """
+    if not _ADMIN_USERNAME or not _ADMIN_PASSWORD:
+        return None
+    if not hmac.compare_digest(str(username).encode(), _ADMIN_USERNAME):
+        return None
+    return hmac.compare_digest(str(password).encode(), _ADMIN_PASSWORD)
+
+LOGIN_PROFILE_CACHE_TIMEOUT = 300  # seconds
+
+def _get_login_profile(user_id):
+    """Profile fields returned by LoginView, cached briefly per user for repeat logins."""
+    key = f"profile:login:{user_id}"
+    profile = cache.get(key)
+    if profile is None:
+        profile = UserProfile.objects(user_id=user_id).only(
+            "contact_number", "gender", "location", "dob", "profile_image_id"
+        ).as_pymongo().first()
+        if profile is None:
+            return None
+        dob = profile.get("dob")
+        profile = {
+            "contact_number": profile.get("contact_number"),
+            "gender": profile.get("gender"),
+            "location": profile.get("location"),
+            "dob": dob.date() if dob else None,  # DateField is stored as a datetime
+            "profile_image_id": profile.get("profile_image_id")
+        }
+        cache.set(key, profile, LOGIN_PROFILE_CACHE_TIMEOUT)
+    return profile
+
 # Setup MongoDB connection for GridFS (profile pictures)
-client = MongoClient(os.getenv("MONGODB_URI"))
+# Reuse MongoEngine's client (and its pool) instead of opening a second one
+client = get_connection()
 db = client[settings.MONGO_DB_NAME]
-fs = gridfs.GridFS(db)
+bucket = gridfs.GridFSBucket(db)
+
+
+@lru_cache(maxsize=None)
+def _image_hash_index():
+    """Create the fs.files index on the content hash, once per process, on first upload."""
+    db["fs.files"].create_index("metadata.sha1")
+
+
+def _hash_upload(uploaded_file):
+    """SHA-1 of an uploaded file, read in Django's upload chunks; leaves the file rewound."""
+    hasher = hashlib.sha1()
+    for chunk in uploaded_file.chunks():
+        hasher.update(chunk)
+    uploaded_file.seek(0)
+    return hasher.hexdigest()
 
 # User Registration with validation
 class RegisterUser(APIView):
@@ -34,34 +116,40 @@ class RegisterUser(APIView):
     permission_classes = []
 
     def post(self, request):
+        # Refuse bodies too large to hold a valid image before the multipart
+        # parser spools them; the per-file size check below still applies,
+        # and is all that runs when the header is malformed
+        try:
+            content_length = int(request.META.get("CONTENT_LENGTH") or 0)
+        except ValueError:
+            content_length = 0
+        if content_length > MAX_REGISTER_BODY_SIZE:
+            return Response({"error": f"Profile image size must not exceed {MAX_IMAGE_SIZE_MB} MB"}, status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+
         data = request.data
 
         # --- Extract fields ---
-        email = data.get("email", "").strip()
-        password = data.get("password", "").strip()
-        first_name = data.get("first_name", "").strip()
-        last_name = data.get("last_name", "").strip()
-        dob = data.get("dob", "").strip()
-        location = data.get("location", "").strip()
-        contact_number = data.get("contact_number", "").strip()
-        gender = data.get("gender", "").strip()
+        (email, password, first_name, last_name,
+         dob, location, contact_number, gender) = [(data.get(f) or "").strip() for f in _REGISTER_FIELDS]
 
         # --- Validation ---
         if not first_name:
             return Response({"error": "First name is required"}, status=status.HTTP_400_BAD_REQUEST)
-        if not first_name.isalpha():
+        # ASCII letters only, matching the last-name rule; isascii() is O(1) on str
+        if not (first_name.isascii() and first_name.isalpha()):
             return Response({"error": "First name should contain only letters"}, status=status.HTTP_400_BAD_REQUEST)
 
         if not last_name:
             return Response({"error": "Last name is required"}, status=status.HTTP_400_BAD_REQUEST)
-        if not re.match(r"^[A-Za-z ]+$", last_name):
+        if not _LAST_NAME_CHARS.issuperset(last_name):
             return Response({"error": "Last name should contain only letters and spaces"}, status=status.HTTP_400_BAD_REQUEST)
         
         if not dob:
             return Response({"error": "Date of birth is required"}, status=status.HTTP_400_BAD_REQUEST)
         else:
             try:
-                datetime.strptime(dob, "%Y-%m-%d")
+                # Keep the parsed date so the profile isn't converted from a string again
+                dob = datetime.strptime(dob, "%Y-%m-%d").date()
             except ValueError:
                 return Response({"error": "Date of birth must be in YYYY-MM-DD format"}, status=status.HTTP_400_BAD_REQUEST)
 
@@ -72,12 +160,13 @@ class RegisterUser(APIView):
             return Response({"error": "Contact number is required"}, status=status.HTTP_400_BAD_REQUEST)
 
         contact_number = contact_number.replace(" ", "")  # remove spaces
-        if contact_number.startswith("+91"):
+        # Slice comparisons: cheaper than startswith() for short literal prefixes
+        if contact_number[:3] == "+91":
             contact_number = contact_number[3:]
-        elif contact_number.startswith("0"):
+        elif contact_number[:1] == "0":
             contact_number = contact_number[1:]
 
-        if not contact_number.isdigit() or len(contact_number) != 10:
+        if len(contact_number) != 10 or not contact_number.isdigit():
             return Response({"error": "Contact number must be exactly 10 digits"}, status=status.HTTP_400_BAD_REQUEST)
 
         if not email:
@@ -96,26 +185,38 @@ class RegisterUser(APIView):
 
         if len(password) < 8:
             return Response({"error": "Password must be at least 8 characters long"}, status=status.HTTP_400_BAD_REQUEST)
-        if not re.search(r"[A-Za-z]", password):
+        # One pass over the password for all three character classes
+        has_letter = has_digit = has_special = False
+        for c in password:
+            if c in _PASSWORD_LETTERS:
+                has_letter = True
+            elif c.isdecimal():
+                has_digit = True
+            elif c in _PASSWORD_SPECIALS:
+                has_special = True
+            else:
+                continue
+            if has_letter and has_digit and has_special:
+                break
+        if not has_letter:
             return Response({"error": "Password must contain at least one letter"}, status=status.HTTP_400_BAD_REQUEST)
-        if not re.search(r"\d", password):
+        if not has_digit:
             return Response({"error": "Password must contain at least one digit"}, status=status.HTTP_400_BAD_REQUEST)
-        if not re.search(r"[!@#$%^&*(),.?\":{}|<>]", password):
+        if not has_special:
             return Response({"error": "Password must contain at least one special character"}, status=status.HTTP_400_BAD_REQUEST)
 
+        # The unique indexes below only exist once migrate_unique_email has run,
+        # so keep rejecting known emails up front; they remain the race backstop
         if User.objects.filter(username=email).exists():
             return Response({"error": "Email already registered"}, status=status.HTTP_400_BAD_REQUEST)
 
         # --- Handle Profile Image Upload ---
-        MAX_IMAGE_SIZE_MB = 5  # Maximum allowed size in MB
-        ALLOWED_IMAGE_TYPES = ["image/jpeg", "image/jpg", "image/png", "image/pjpeg", "image/x-png"]  # Allowed MIME types
-
         profile_image_id = None
         if "profile_image" in request.FILES:
             uploaded_file = request.FILES["profile_image"]
             
             # 1️⃣ Check file size
-            if uploaded_file.size > MAX_IMAGE_SIZE_MB * 1024 * 1024:
+            if uploaded_file.size > MAX_IMAGE_SIZE_BYTES:
                 return Response({"error": f"Profile image size must not exceed {MAX_IMAGE_SIZE_MB} MB"},status=status.HTTP_400_BAD_REQUEST)
 
             # 2️⃣ Check file type
@@ -123,16 +224,14 @@ class RegisterUser(APIView):
             if content_type.lower() not in ALLOWED_IMAGE_TYPES:
                 return Response({"error": "Invalid file type. Only JPG, JPEG, and PNG are allowed."},status=status.HTTP_400_BAD_REQUEST)
 
-            # 3️⃣ Read bytes and store in GridFS
-            file_bytes = uploaded_file.read()
+            # 3️⃣ Check the signature bytes; content_type is only what the client claims
+            header = uploaded_file.read(8)
+            uploaded_file.seek(0)
+            if not header.startswith(_IMAGE_SIGNATURES):
+                return Response({"error": "Invalid file type. Only JPG, JPEG, and PNG are allowed."},status=status.HTTP_400_BAD_REQUEST)
+
+            # The image is only written once the Django user exists (see below)
             safe_filename = f"{uuid.uuid4()}_{uploaded_file.name}"
-            try:
-                profile_image_id = fs.put(
-                file_bytes,
-                filename=safe_filename,
-                content_type=content_type)
-            except Exception as e:
-                return Response({"error": f"Failed to store profile image: {str(e)}"},status=status.HTTP_500_INTERNAL_SERVER_ERROR)
         else:
             return Response({"error": "Image is mandatory"}, status=status.HTTP_400_BAD_REQUEST)
             
@@ -140,6 +239,8 @@ class RegisterUser(APIView):
         # --- End Profile Image Upload ---
 
         # --- Create User & Profile ---
+        # Only the SQL insert runs inside the transaction, so the database lock
+        # isn't held across the GridFS and MongoDB round trips that follow
         try:
             with transaction.atomic():
                 user = User.objects.create_user(
@@ -149,29 +250,62 @@ class RegisterUser(APIView):
                     first_name=first_name,
                     last_name=last_name
                 )
+        except IntegrityError:
+            # Duplicates are caught by the unique username index
+            return Response({"error": "Email already registered"}, status=status.HTTP_400_BAD_REQUEST)
+        except Exception as e:
+            return Response({"error": f"Registration failed: {str(e)}"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-                profile = UserProfile(
-                    user_id=str(user.id),
-                    email=email,
-                    first_name=first_name,
-                    last_name=last_name,
-                    dob=dob,
-                    location=location,
-                    contact_number=contact_number,
-                    profile_image_id=str(profile_image_id) if profile_image_id else None,  # ✅ consistent field
-                    gender=gender,
-                    is_approved=True
-                )
-                profile.save()
+        image_is_new = False
+        try:
+            # 4️⃣ Stream the upload into GridFS chunk by chunk. Doing it after
+            # create_user means a duplicate email never writes the blob.
+            # Identical images are stored once and shared by file id
+            try:
+                _image_hash_index()
+                sha1 = _hash_upload(uploaded_file)
+                existing = db["fs.files"].find_one({"metadata.sha1": sha1}, {"_id": 1})
+                if existing:
+                    profile_image_id = existing["_id"]
+                else:
+                    profile_image_id = bucket.upload_from_stream(
+                        safe_filename,
+                        uploaded_file,
+                        metadata={"content_type": content_type, "sha1": sha1}
+                    )
+                    image_is_new = True
+            except Exception as e:
+                user.delete()
+                return Response({"error": f"Failed to store profile image: {str(e)}"},status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+            profile = UserProfile(
+                user_id=str(user.id),
+                email=email,
+                first_name=first_name,
+                last_name=last_name,
+                dob=dob,
+                location=location,
+                contact_number=contact_number,
+                profile_image_id=str(profile_image_id) if profile_image_id else None,  # ✅ consistent field
+                gender=gender,
+                is_approved=True
+            )
+            # Input is validated above, so insert the converted document
+            # directly instead of going through MongoEngine's save()
+            UserProfile._get_collection().insert_one(profile.to_mongo())
 
         except Exception as e:
-            User.objects.filter(username=email).delete()
-            # delete GridFS file if uploaded (avoid orphans)
+            # The Django user is already committed: remove it and the GridFS file (avoid orphans).
+            # A reused file belongs to other profiles too, so it is left alone
             try:
-                if profile_image_id:
-                    fs.delete(ObjectId(profile_image_id))
+                user.delete()
+                if image_is_new:
+                    bucket.delete(ObjectId(profile_image_id))
             except Exception:
                 pass
+            # Duplicates are caught by the unique email index
+            if isinstance(e, DuplicateKeyError):
+                return Response({"error": "Email already registered"}, status=status.HTTP_400_BAD_REQUEST)
             return Response({"error": f"Registration failed: {str(e)}"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
         return Response({"message": "User registered, pending approval"}, status=status.HTTP_201_CREATED)
@@ -190,13 +324,18 @@ class LoginView(APIView):
             return Response({"error": "Username and password are required"}, status=400)
 
         # ✅ Admin login check
-        if username == settings.ADMIN_USERNAME and password == settings.ADMIN_PASSWORD:
+        # The admin has no Django user, so a wrong admin password is rejected
+        # here rather than paying for a password hash in authenticate()
+        admin_login = _check_admin_login(username, password)
+        if admin_login is False:
+            return Response({"error": "Invalid Credentials."}, status=401)
+        if admin_login:
             payload = {
                 "username": username,
                 "role": "admin",
-                "exp": datetime.now(timezone.utc) + timedelta(seconds=settings.JWT_EXP_DELTA)
+                "exp": datetime.now(timezone.utc) + _JWT_EXP_DELTA
             }
-            token = jwt.encode(payload, settings.JWT_SECRET, algorithm=settings.JWT_ALGORITHM)
+            token = jwt.encode(payload, _JWT_SECRET, algorithm=_JWT_ALGORITHM)
 
             return Response({
                 "message": "Admin login successful",
@@ -207,14 +346,14 @@ class LoginView(APIView):
         # ✅ Normal user login check
         user = authenticate(username=username, password=password)
         if user:
-            profile = UserProfile.objects(user_id=str(user.id)).first()
+            profile = _get_login_profile(str(user.id))
             payload = {
                     "user_id": str(user.id),
                     "username": username,
                     "role": "user",
-                    "exp": datetime.now(timezone.utc) + timedelta(seconds=settings.JWT_EXP_DELTA)
+                    "exp": datetime.now(timezone.utc) + _JWT_EXP_DELTA
                 }
-            token = jwt.encode(payload, settings.JWT_SECRET, algorithm=settings.JWT_ALGORITHM)
+            token = jwt.encode(payload, _JWT_SECRET, algorithm=_JWT_ALGORITHM)
 
             return Response({
                     "message": "Login successful",
@@ -225,11 +364,11 @@ class LoginView(APIView):
                         "email": user.email,
                         "first_name": user.first_name,
                         "last_name": user.last_name,
-                        "contact_number": profile.contact_number,
-                        "gender": profile.gender,
-                        "location": profile.location,
-                        "dob": profile.dob,
-                        "profile_image_id": profile.profile_image_id
+                        "contact_number": profile["contact_number"],
+                        "gender": profile["gender"],
+                        "location": profile["location"],
+                        "dob": profile["dob"],
+                        "profile_image_id": profile["profile_image_id"]
                     }
                 })
             
@@ -246,16 +385,24 @@ class PastTrips(APIView):
         if not user_id:
             return Response({"error": "user_id is required"}, status=status.HTTP_400_BAD_REQUEST)
         
-        trips = UserItinerary.objects(user_id=str(user_id))
-        data = [{
-            "destination": t.itinerary_data["summary"]["destination"],
-            "budget": t.itinerary_data["summary"]["proposed_budget"],
-            "start_date": t.itinerary_data["summary"]["start_date"],
-            "end_date": t.itinerary_data["summary"]["end_date"],
-            "actual_cost": t.itinerary_data["summary"]["actual_cost"]
-        } for t in trips]
+        # Mongo flattens the summary fields into the response rows itself
+        data = list(UserItinerary._get_collection().aggregate(
+            [
+                {"$match": {"user_id": str(user_id)}},
+                {"$project": {
+                    "_id": 0,
+                    "destination": "$itinerary_data.summary.destination",
+                    "budget": "$itinerary_data.summary.proposed_budget",
+                    "start_date": "$itinerary_data.summary.start_date",
+                    "end_date": "$itinerary_data.summary.end_date",
+                    "actual_cost": "$itinerary_data.summary.actual_cost",
+                }},
+            ],
+            batchSize=500  # the projected rows are small; fetch a typical history in one batch
+        ))
         
-        return Response(data)
+        # Plain JSON list: encode directly rather than through DRF's renderer
+        return JsonResponse(data, safe=False)
 
 
 
@@ -263,38 +410,51 @@ class PastTrips(APIView):
 @authentication_classes([JWTAuthentication])
 @permission_classes([IsUser])
 class SuggestDestination(APIView):
-    def post(self, request):
-        data = request.data
+    # Required fields
+    REQUIRED_FIELDS = [
+        "user_id", "name", "destination",
+        "avg_time", "estimated_cost",
+        "tags", "type", "location"
+    ]
 
-        # Required fields
-        required_fields = [
-            "user_id", "name", "destination",
-            "avg_time", "estimated_cost",
-            "tags", "type", "location"
-        ]
-        for field in required_fields:
-            if field not in data:
-                return Response({"error": f"{field} is required"}, status=400)
-
-        # Validate location
-        if "lat" not in data["location"] or "lng" not in data["location"]:
-            return Response({"error": "location must include lat and lng"}, status=400)
+    def post(self, request):
+        # Accept a single suggestion or a list of them
+        many = isinstance(request.data, list)
+        items = request.data if many else [request.data]
+        if not items:
+            return Response({"error": "No suggestions submitted"}, status=400)
+
+        docs = []
+        for data in items:
+            for field in self.REQUIRED_FIELDS:
+                if field not in data:
+                    return Response({"error": f"{field} is required"}, status=400)
+
+            # Validate location
+            if "lat" not in data["location"] or "lng" not in data["location"]:
+                return Response({"error": "location must include lat and lng"}, status=400)
+
+            suggestion = DestinationSuggestion(
+                user_id=data["user_id"],
+                name=data["name"],
+                destination=data["destination"],
+                avg_time=float(data["avg_time"]),
+                estimated_cost=float(data["estimated_cost"]),
+                tags=data["tags"],
+                type=data["type"],
+                location={
+                    "lat": float(data["location"]["lat"]),
+                    "lng": float(data["location"]["lng"])
+                }
+            )
+            docs.append(suggestion.to_mongo())
 
-        # Save suggestion
-        suggestion = DestinationSuggestion(
-            user_id=data["user_id"],
-            name=data["name"],
-            destination=data["destination"],
-            avg_time=float(data["avg_time"]),
-            estimated_cost=float(data["estimated_cost"]),
-            tags=data["tags"],
-            type=data["type"],
-            location={
-                "lat": float(data["location"]["lat"]),
-                "lng": float(data["location"]["lng"])
-            }
-        )
-        suggestion.save()
+        # Write straight through the driver: one round trip for the whole batch
+        collection = DestinationSuggestion._get_collection()
+        if many:
+            collection.insert_many(docs, ordered=False)
+            return Response({"message": f"{len(docs)} destination suggestions submitted"}, status=201)
+        collection.insert_one(docs[0])
 
         return Response({"message": "Destination suggestion submitted"}, status=201)
 
@@ -311,7 +471,11 @@ class SubmitComplaint(APIView):
             subject=data["subject"],
             message=data["message"]
         )
-        complaint.save()
+        Complaint._get_collection().insert_one(complaint.to_mongo())
+        # Profiles created before the counters existed are left to the DashboardStats fallback
+        UserProfile.objects(user_id=str(data["user_id"]), complaint_count__exists=True).update_one(
+            inc__complaint_count=1
+        )
         return Response({"message": "Complaint submitted"}, status=201)
     
 
@@ -321,18 +485,23 @@ class SubmitComplaint(APIView):
 class UserComplaints(APIView):
     def get(self, request):
         user_id = request.user.id
-        complaints = Complaint.objects(user_id=str(user_id)).order_by('-id')  # MongoDB syntax
+        # Raw dicts with only the listed fields, newest first
+        complaints = Complaint._get_collection().find(
+            {"user_id": str(user_id)},
+            {"subject": 1, "message": 1, "reply": 1, "created_at": 1, "updated_at": 1}
+        ).sort("_id", -1)
         
-        complaints_data = []
-        for complaint in complaints:
-            complaints_data.append({
-                'id': str(complaint.id),  # MongoDB ObjectId to string
-                'subject': complaint.subject,
-                'message': complaint.message,
-                'admin_reply': complaint.reply,  # Map reply field to admin_reply
-                'created_at': complaint.created_at.isoformat() if hasattr(complaint, 'created_at') and complaint.created_at else None,
-                'reply_date': complaint.updated_at.isoformat() if hasattr(complaint, 'updated_at') and complaint.reply and complaint.updated_at else None,
-            })
+        complaints_data = [
+            {
+                'id': str(c['_id']),  # MongoDB ObjectId to string
+                'subject': c.get('subject'),
+                'message': c.get('message'),
+                'admin_reply': c.get('reply', ""),  # Map reply field to admin_reply
+                'created_at': c['created_at'].isoformat() if c.get('created_at') else None,
+                'reply_date': c['updated_at'].isoformat() if c.get('reply') and c.get('updated_at') else None,
+            }
+            for c in complaints
+        ]
         
         return Response({'complaints': complaints_data}, status=200)
 
@@ -353,7 +522,7 @@ class ReviewTrip(APIView):
             start_date=datetime.strptime(data["start_date"], "%Y-%m-%d") if data.get("start_date") else None,  # New field
             end_date=datetime.strptime(data["end_date"], "%Y-%m-%d") if data.get("end_date") else None  # New field
         )
-        review.save()
+        TripReview._get_collection().insert_one(review.to_mongo())
         return Response({"message": "Review submitted"}, status=201)
 
 
@@ -364,19 +533,22 @@ class ReviewTrip(APIView):
 class MyReviews(APIView):
     def post(self, request):
         user_id = request.data.get("user_id")
-        reviews = TripReview.objects.filter(user_id=user_id).order_by('-id')
-        print(f"📝 Review data: {reviews}")
+        # Raw dicts: skips building a TripReview document per row
+        reviews = TripReview.objects(user_id=user_id).only(
+            "trip_id", "rating", "review", "origin", "destination",
+            "start_date", "end_date", "created_at"
+        ).order_by('-id').as_pymongo()
         
         review_data = [
             {
-                'trip_id': review.trip_id,
-                'rating': review.rating,
-                'review': review.review,
-                'origin': getattr(review, 'origin', ''),
-                'destination': getattr(review, 'destination', ''),
-                'start_date': getattr(review, 'start_date', None).isoformat() if getattr(review, 'start_date', None) else '',
-                'end_date': getattr(review, 'end_date', None).isoformat() if getattr(review, 'end_date', None) else '',
-                'created_at': review.created_at
+                'trip_id': review.get('trip_id'),
+                'rating': review.get('rating'),
+                'review': review.get('review'),
+                'origin': review.get('origin'),
+                'destination': review.get('destination'),
+                'start_date': review['start_date'].isoformat() if review.get('start_date') else '',
+                'end_date': review['end_date'].isoformat() if review.get('end_date') else '',
+                'created_at': review.get('created_at')
             }
             for review in reviews
         ]
@@ -399,8 +571,7 @@ class UnreviewedTrips(APIView):
             print(f"📝 Total trips for user {user_id}: {len(trips)}")
 
             # Get all reviewed trip IDs for this user
-            reviewed_trips = TripReview.objects.filter(user_id=user_id).only("trip_id")
-            reviewed_trip_ids = set(str(r.trip_id) for r in reviewed_trips)
+            reviewed_trip_ids = set(map(str, TripReview.objects(user_id=user_id).distinct("trip_id")))
             print(f"📝 Reviewed trip IDs: {reviewed_trip_ids}")
 
             # Filter trips that are not reviewed
@@ -441,18 +612,29 @@ class DashboardStats(APIView):
 
         user_id = str(user_id)  # convert to string to match DB
 
-        trips = UserItinerary.objects(user_id=user_id)
-        total_trips = trips.count()
-        # Compute average proposed_budget
-        if total_trips > 0:
-            avg_budget = sum(
-                t.itinerary_data["summary"]["actual_cost"] for t in trips
-            ) / total_trips
-        else:
-            avg_budget = 0
+        profile = UserProfile.objects(user_id=user_id).only(
+            "trip_count", "trip_budget_sum", "complaint_count"
+        ).as_pymongo().first()
 
-        # Complaints still fetched from Complaint collection if needed
-        complaints = Complaint.objects(user_id=user_id).count()
+        if profile and "trip_count" in profile:
+            # Counters are maintained on write, so no per-trip query is needed
+            total_trips = profile["trip_count"]
+            avg_budget = profile["trip_budget_sum"] / total_trips if total_trips > 0 else 0
+            complaints = profile.get("complaint_count", 0)
+        else:
+            # Profiles without counters: compute from the source collections.
+            # Trip count and average actual cost come back from a single aggregation
+            result = list(UserItinerary.objects(user_id=user_id).aggregate([
+                {"$group": {
+                    "_id": None,
+                    "total": {"$sum": 1},
+                    "avg": {"$avg": "$itinerary_data.summary.actual_cost"}
+                }}
+            ]))
+            complaints = Complaint.objects(user_id=user_id).count()
+
+            total_trips = result[0]["total"] if result else 0
+            avg_budget = (result[0]["avg"] or 0) if result else 0
 
         return Response({
             "total_trips": total_trips,
@@ -460,40 +642,56 @@ class DashboardStats(APIView):
             "complaints_filed": complaints
         })
 
+# Image ids are never reused, so a stored image can be cached indefinitely by the client
+PROFILE_IMAGE_CACHE_CONTROL = "private, max-age=86400, immutable"
+
+def _stream_image(grid_out):
+    """Send a GridFS image back one stored chunk at a time instead of reading it whole."""
+    # Bucket uploads keep the type in metadata; older fs.put() files have contentType
+    content_type = (grid_out.metadata or {}).get("content_type") or grid_out.content_type or "image/jpeg"
+    response = StreamingHttpResponse(iter(grid_out.readchunk, b""), content_type=content_type)
+    response["Content-Length"] = grid_out.length
+    return response
+
+def _profile_image_response(request, image_id):
+    """Stream a stored profile image, or answer 304 if the client already holds it."""
+    etag = f'"{image_id}"'
+    if etag in parse_etags(request.META.get("HTTP_IF_NONE_MATCH", "")):
+        # Client copy is current: skip GridFS entirely
+        response = HttpResponseNotModified()
+    else:
+        try:
+            grid_out = bucket.open_download_stream(ObjectId(image_id))
+        except Exception:
+            return Response({"error": "Failed to retrieve image"}, status=500)
+        response = _stream_image(grid_out)
+    response["ETag"] = etag
+    response["Cache-Control"] = PROFILE_IMAGE_CACHE_CONTROL
+    return response
+
 # Profile Picture Retrieval
 @authentication_classes([JWTAuthentication])
 @permission_classes([IsUser])
 class ProfilePictureView(APIView):
     def get(self, request):
         # Fetch the profile for the logged-in user
-        profile = UserProfile.objects(user_id=str(request.user.id)).first()
+        profile = UserProfile.objects(user_id=str(request.user.id)).only("profile_image_id").first()
         
         # If no profile or no image
         if not profile or not profile.profile_image_id:
             return Response({"error": "No profile picture found"}, status=404)
 
-        # Fetch image from GridFS
-        try:
-            grid_out = fs.get(ObjectId(profile.profile_image_id))
-        except Exception:
-            return Response({"error": "Failed to retrieve image"}, status=500)
-
         # Return the image as binary
-        return HttpResponse(grid_out.read(), content_type="image/jpeg")
+        return _profile_image_response(request, profile.profile_image_id)
 
 # View other user's profile picture (Admin only)
 @authentication_classes([JWTAuthentication])
 @permission_classes([IsAdmin])
 class UserProfilePictureView(APIView):
     def get(self, request, user_id):
-        profile = UserProfile.objects(id=user_id).first()
+        profile = UserProfile.objects(id=user_id).only("profile_image_id").first()
 
         if not profile or not profile.profile_image_id:
             return Response({"error": "No profile picture found"}, status=404)
 
-        try:
-            grid_out = fs.get(ObjectId(profile.profile_image_id))
-        except Exception:
-            return Response({"error": "Failed to retrieve image"}, status=500)
-
-        return HttpResponse(grid_out.read(), content_type="image/jpeg")
+        return _profile_image_response(request, profile.profile_image_id)
@@ -1,23 +1,51 @@
 from rest_framework.decorators import api_view, authentication_classes, permission_classes
 from rest_framework.response import Response
 from rest_framework import status
-from .ml.predict import predict_budget
+from .ml.predict import predict_budget_cached
 from .utils.google import get_route_info, get_places
 from .utils.weather import get_weather
 from .utils.db import get_hidden_spots
 from datetime import datetime, timedelta, time
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
 import math
 import logging
 from django.core.cache import cache
 from django.conf import settings
 from api.auth import JWTAuthentication
 from api.permissions import IsUser
-from api.models import UserItinerary
+from api.models import UserItinerary, UserProfile
 
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Upper bound on concurrent weather API requests per itinerary
+WEATHER_FETCH_WORKERS = 8
+
+# Largest page get_user_itineraries returns when a limit is given
+MAX_ITINERARY_PAGE_SIZE = 100
+
+# Itinerary writes run here so generate_itinerary can respond before the save finishes
+_persist_pool = ThreadPoolExecutor(max_workers=4)
+
+
+def _cache_duration(cache_key):
+    """Cache for different durations based on data type."""
+    if 'weather' in cache_key:
+        return 1800  # 30 minutes for weather
+    elif 'places' in cache_key or 'hidden' in cache_key:
+        return 3600  # 1 hour for places
+    elif 'route' in cache_key:
+        return 7200  # 2 hours for routes
+    return 300  # 5 minutes default
+
+
+def stable_cache_key(prefix, *parts):
+    """Cache key that is the same in every worker process, unlike the builtin hash()."""
+    digest = hashlib.blake2b("|".join(map(str, parts)).encode(), digest_size=16).hexdigest()
+    return f"{prefix}_{digest}"
+
 
 def get_cached_or_fetch(cache_key, fetch_function, *args, **kwargs):
     """Get data from cache or fetch from API with caching."""
@@ -29,17 +57,7 @@ def get_cached_or_fetch(cache_key, fetch_function, *args, **kwargs):
     try:
         logger.info(f"Fetching fresh data for {cache_key}")
         data = fetch_function(*args, **kwargs)
-        
-        # Cache for different durations based on data type
-        cache_duration = 300  # 5 minutes default
-        if 'weather' in cache_key:
-            cache_duration = 1800  # 30 minutes for weather
-        elif 'places' in cache_key or 'hidden' in cache_key:
-            cache_duration = 3600  # 1 hour for places
-        elif 'route' in cache_key:
-            cache_duration = 7200  # 2 hours for routes
-            
-        cache.set(cache_key, data, cache_duration)
+        cache.set(cache_key, data, _cache_duration(cache_key))
         return data
         
     except Exception as e:
@@ -47,32 +65,81 @@ def get_cached_or_fetch(cache_key, fetch_function, *args, **kwargs):
         return None
 
 
-def estimate_internal_travel_time(loc1, loc2):
-    """Estimate travel time between two locations based on distance."""
+def get_many_cached_or_fetch(jobs, fetch_function, max_workers=WEATHER_FETCH_WORKERS):
+    """Batch get_cached_or_fetch for a {cache_key: args} mapping.
+    
+    Hits come from a single cache.get_many, misses are fetched concurrently
+    and stored with a single cache.set_many. Failed fetches map to None and
+    are not cached.
+    """
+    results = {key: data for key, data in cache.get_many(jobs).items() if data}
+    missing = [key for key in jobs if key not in results]
+    logger.info(f"Cache hits for {len(results)} of {len(jobs)} keys")
+    if not missing:
+        return results
+    
+    def fetch(cache_key):
+        try:
+            return True, fetch_function(*jobs[cache_key])
+        except Exception as e:
+            logger.error(f"API fetch error for {cache_key}: {e}")
+            return False, None
+    
+    fresh_by_duration = {}
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(missing))) as executor:
+        for cache_key, (ok, data) in zip(missing, executor.map(fetch, missing)):
+            results[cache_key] = data
+            if ok:
+                fresh_by_duration.setdefault(_cache_duration(cache_key), {})[cache_key] = data
+    for cache_duration, fresh in fresh_by_duration.items():
+        cache.set_many(fresh, cache_duration)
+    return results
+
+
+def _travel_point(loc):
+    """Convert a {'lat', 'lng'} location to (lat_rad, lng_rad, cos_lat), or None if malformed."""
     try:
-        lat1, lon1 = float(loc1['lat']), float(loc1['lng'])
-        lat2, lon2 = float(loc2['lat']), float(loc2['lng'])
-        
-        # Haversine formula for more accurate distance calculation
-        R = 6371  # Earth's radius in km
-        
-        dlat = math.radians(lat2 - lat1)
-        dlon = math.radians(lon2 - lon1)
-        a = (math.sin(dlat/2) * math.sin(dlat/2) + 
-             math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * 
-             math.sin(dlon/2) * math.sin(dlon/2))
-        c = 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
-        distance_km = R * c
-        
-        # Estimate travel time: 40 km/h average speed in cities, 60 km/h outside
-        avg_speed = 40 if distance_km < 50 else 60
-        travel_hours = distance_km / avg_speed
-        
-        return round(max(0.25, travel_hours), 2)  # Minimum 15 minutes
-        
+        lat = math.radians(float(loc['lat']))
+        lng = math.radians(float(loc['lng']))
+        return lat, lng, math.cos(lat)
     except (KeyError, ValueError, TypeError) as e:
         logger.warning(f"Error calculating travel time: {e}")
+        return None
+
+
+def _travel_time_between(point1, point2):
+    """Estimate travel time between two points prepared by _travel_point."""
+    if point1 is None or point2 is None:
         return 0.5  # Default 30 minutes
+    
+    lat1, lon1, cos_lat1 = point1
+    lat2, lon2, cos_lat2 = point2
+    
+    # Haversine formula for more accurate distance calculation
+    R = 6371  # Earth's radius in km
+    
+    sin_dlat = math.sin((lat2 - lat1) / 2)
+    sin_dlon = math.sin((lon2 - lon1) / 2)
+    a = sin_dlat * sin_dlat + cos_lat1 * cos_lat2 * sin_dlon * sin_dlon
+    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
+    distance_km = R * c
+    
+    # Estimate travel time: 40 km/h average speed in cities, 60 km/h outside
+    avg_speed = 40 if distance_km < 50 else 60
+    travel_hours = distance_km / avg_speed
+    
+    return round(max(0.25, travel_hours), 2)  # Minimum 15 minutes
+
+
+def estimate_internal_travel_time(loc1, loc2):
+    """Estimate travel time between two locations based on distance."""
+    return _travel_time_between(_travel_point(loc1), _travel_point(loc2))
+
+
+# "%I:%M %p" for every minute of the day, indexed by hours * 60 + minutes
+_TIME_STRINGS = tuple(
+    time(hour=m // 60, minute=m % 60).strftime("%I:%M %p") for m in range(24 * 60)
+)
 
 
 def format_time_from_float(hour_float):
@@ -81,16 +148,22 @@ def format_time_from_float(hour_float):
         # Handle cases where hour_float might exceed 24 hours
         hour_float = hour_float % 24
         hours = int(hour_float)
-        minutes = int((hour_float * 60) % 60)
-        time_obj = time(hour=hours, minute=minutes)
-        return time_obj.strftime("%I:%M %p")
+        minutes = int(hour_float * 60) % 60
+        return _TIME_STRINGS[hours * 60 + minutes]
     except (ValueError, TypeError) as e:
         logger.warning(f"Error formatting time {hour_float}: {e}")
         return "12:00 PM"
 
 
+# Tags that mark a spot as off the beaten track
+_HIDDEN_TAGS = frozenset({"hidden", "secret", "offbeat", "local"})
+
+
 def get_priority_score(spot, interests):
-    """Enhanced priority score that favors hidden places."""
+    """Enhanced priority score that favors hidden places.
+    
+    interests can be any container; pass a set when scoring many spots.
+    """
     try:
         base_score = 1 if spot.get("type") in interests else 0
         
@@ -100,7 +173,7 @@ def get_priority_score(spot, interests):
         
         # Additional bonus for spots with "hidden" tags
         spot_tags = spot.get("tags", [])
-        if any(tag in ["hidden", "secret", "offbeat", "local"] for tag in spot_tags):
+        if not _HIDDEN_TAGS.isdisjoint(spot_tags):
             base_score += 1.5  # Boost for hidden-tagged spots
         
         # Bonus points for higher ratings
@@ -123,39 +196,43 @@ def get_priority_score(spot, interests):
 
 
 def validate_request_data(data):
-    """Validate incoming request data."""
+    """Validate incoming request data.
+    
+    Returns (is_valid, error_message, (start_date, end_date)); the dates are
+    the ones parsed here, or None when validation fails.
+    """
     required_fields = ["starting_location", "destination", "start_date", "end_date", "budget"]
     missing_fields = [field for field in required_fields if not data.get(field)]
     
     if missing_fields:
-        return False, f"Missing required fields: {', '.join(missing_fields)}"
+        return False, f"Missing required fields: {', '.join(missing_fields)}", None
     
     try:
         budget = float(data["budget"])
         if budget <= 0:
-            return False, "Budget must be a positive number"
+            return False, "Budget must be a positive number", None
     except (ValueError, TypeError):
-        return False, "Invalid budget format"
+        return False, "Invalid budget format", None
     
     try:
         start_date = datetime.strptime(data["start_date"], '%Y-%m-%d').date()
         end_date = datetime.strptime(data["end_date"], '%Y-%m-%d').date()
         
         if start_date > end_date:
-            return False, "Start date must be before end date"
+            return False, "Start date must be before end date", None
             
         # Check if dates are too far in the past
         if start_date < datetime.now().date():
-            return False, "Start date cannot be in the past"
+            return False, "Start date cannot be in the past", None
             
         # Check if trip is too long (max 30 days)
         if (end_date - start_date).days > 30:
-            return False, "Trip duration cannot exceed 30 days"
+            return False, "Trip duration cannot exceed 30 days", None
             
     except ValueError:
-        return False, "Invalid date format. Use YYYY-MM-DD"
+        return False, "Invalid date format. Use YYYY-MM-DD", None
     
-    return True, ""
+    return True, "", (start_date, end_date)
 
 
 def optimize_itinerary_schedule(spots, duration, daily_hours=8):
@@ -235,6 +312,24 @@ def add_meal_breaks(day_itinerary, restaurants, current_hour, day_num):
     return meals_added, current_hour
 
 
+def save_itinerary(user_id, response_data):
+    """Persist a generated itinerary and bump the owner's dashboard counters."""
+    try:
+        user_itinerary = UserItinerary(
+            user_id=user_id, 
+            itinerary_data=response_data
+        )
+        user_itinerary.save()
+        # Keep the dashboard counters on the profile in step
+        UserProfile.objects(user_id=str(user_id), trip_count__exists=True).update_one(
+            inc__trip_count=1,
+            inc__trip_budget_sum=response_data["summary"]["actual_cost"]
+        )
+        logger.info(f"Itinerary saved successfully for user {user_id}")
+    except Exception as e:
+        logger.error(f"Failed to save itinerary: {e}")
+
+
 @api_view(['POST'])
 @authentication_classes([JWTAuthentication])
 @permission_classes([IsUser])
@@ -254,7 +349,7 @@ def generate_itinerary(request):
         logger.info(f"Generating itinerary for user {user_id}")
         
         # Validate request data
-        is_valid, error_message = validate_request_data(data)
+        is_valid, error_message, trip_dates = validate_request_data(data)
         if not is_valid:
             return Response(
                 {"error": error_message}, 
@@ -268,28 +363,36 @@ def generate_itinerary(request):
         interests = data.get("interests", [])
         travel_type = data.get("travel_type", "solo")
         
-        # Parse dates
-        start_date = datetime.strptime(data["start_date"], '%Y-%m-%d').date()
-        end_date = datetime.strptime(data["end_date"], '%Y-%m-%d').date()
+        # Dates as parsed by validate_request_data
+        start_date, end_date = trip_dates
         duration = (end_date - start_date).days + 1
         
         logger.info(f"Trip details: {origin} -> {destination}, {duration} days, ₹{budget}")
         
         # Get ML budget prediction
         try:
-            predicted_budget = predict_budget({
-                "destination": destination,
-                "duration": duration,
-                "travel_type": travel_type,
-                "interest": interests[0] if interests else "general"
-            })
+            predicted_budget = predict_budget_cached(
+                destination,
+                duration,
+                travel_type,
+                interests[0] if interests else "general"
+            )
         except Exception as e:
             logger.warning(f"Budget prediction failed: {e}")
             predicted_budget = budget * 1.1  # 10% buffer as fallback
         
-        # Fetch route information with caching
-        route_cache_key = f"route_{hash(origin)}_{hash(destination)}"
-        route = get_cached_or_fetch(route_cache_key, get_route_info, origin, destination)
+        # Fetch route information, places and hidden spots with caching.
+        # The three lookups are independent, so they run concurrently
+        route_cache_key = stable_cache_key("route", origin, destination)
+        places_cache_key = stable_cache_key("places", destination, *sorted(interests))
+        hidden_cache_key = stable_cache_key("hidden", destination, *sorted(interests))
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            route_future = executor.submit(get_cached_or_fetch, route_cache_key, get_route_info, origin, destination)
+            pois_future = executor.submit(get_cached_or_fetch, places_cache_key, get_places, destination, interests)
+            hidden_future = executor.submit(get_cached_or_fetch, hidden_cache_key, get_hidden_spots, destination, interests)
+            route = route_future.result()
+            pois = pois_future.result()
+            hidden = hidden_future.result()
         
         if not route:
             logger.warning("Route API failed, using fallback")
@@ -302,13 +405,6 @@ def generate_itinerary(request):
         
         initial_travel_time = route.get('duration_hours', 6.0)
         
-        # Fetch places and hidden spots with caching
-        places_cache_key = f"places_{hash(destination)}_{'_'.join(sorted(interests))}"
-        pois = get_cached_or_fetch(places_cache_key, get_places, destination, interests)
-        
-        hidden_cache_key = f"hidden_{hash(destination)}_{'_'.join(sorted(interests))}"
-        hidden = get_cached_or_fetch(hidden_cache_key, get_hidden_spots, destination, interests)
-        
         # Handle API failures gracefully
         if not pois:
             pois = []
@@ -324,31 +420,33 @@ def generate_itinerary(request):
             if 'tags' not in spot:
                 spot['tags'] = ['hidden']
         
-        # Combine and deduplicate spots
-        all_spots_dict = {}
-        for spot in pois + hidden:
-            spot_name = spot.get('name', 'Unknown')
-            if spot_name not in all_spots_dict:
-                # Add priority score to each spot
-                spot['priority_score'] = get_priority_score(spot, interests)
-                all_spots_dict[spot_name] = spot
+        # Combine and deduplicate spots by name; curated hidden spots win over places results
+        all_spots_dict = {spot.get('name', 'Unknown'): spot for spot in pois}
+        all_spots_dict.update((spot.get('name', 'Unknown'), spot) for spot in hidden)
         
         all_spots = list(all_spots_dict.values())
         
+        # Add priority score to each spot
+        interest_set = frozenset(interests)
+        for spot in all_spots:
+            spot['priority_score'] = get_priority_score(spot, interest_set)
+        
         # Log hidden spots found
         hidden_count = sum(1 for spot in all_spots if spot.get('is_hidden', False))
         logger.info(f"Found {hidden_count} hidden spots out of {len(all_spots)} total spots")
         
-        # Categorize spots
-        hotels = sorted(
-            [s for s in all_spots if s.get("type") == "hotel"], 
-            key=lambda x: x.get('estimated_cost', 0)
-        )
-        restaurants = sorted(
-            [s for s in all_spots if s.get("type") == "restaurant"], 
-            key=lambda x: x.get('estimated_cost', 0)
-        )
-        attractions = [s for s in all_spots if s.get("type") not in ("hotel", "restaurant")]
+        # Categorize spots in a single pass
+        hotels, restaurants, attractions = [], [], []
+        for spot in all_spots:
+            spot_type = spot.get("type")
+            if spot_type == "hotel":
+                hotels.append(spot)
+            elif spot_type == "restaurant":
+                restaurants.append(spot)
+            else:
+                attractions.append(spot)
+        hotels.sort(key=lambda x: x.get('estimated_cost', 1000))  # Same default the nightly cost uses below
+        restaurants.sort(key=lambda x: x.get('estimated_cost', 0))
         
         # Budget allocation
         cost_accumulated = 0
@@ -360,17 +458,16 @@ def generate_itinerary(request):
         hotel_budget_limit = budget * 0.5
         
         if hotels:
+            # Hotels are sorted by nightly cost, so only the cheapest can be the first one within budget
             num_nights = max(1, duration - 1)
-            for hotel in hotels:
-                potential_cost = hotel.get("estimated_cost", 1000) * num_nights
-                if chosen_hotel is None and potential_cost <= hotel_budget_limit:
-                    chosen_hotel = hotel
-                    hotel_cost_total = potential_cost
-                    cost_accumulated += hotel_cost_total
-                    break
+            potential_cost = hotels[0].get("estimated_cost", 1000) * num_nights
+            if potential_cost <= hotel_budget_limit:
+                chosen_hotel = hotels[0]
+                hotel_cost_total = potential_cost
+                cost_accumulated += hotel_cost_total
             
             # Store alternatives
-            alternative_hotels = [h for h in hotels if h != chosen_hotel][:5]
+            alternative_hotels = hotels[1:6] if chosen_hotel else hotels[:5]
         
         # Select attractions within remaining budget
         attraction_budget = budget - cost_accumulated
@@ -451,9 +548,27 @@ def generate_itinerary(request):
         daily_activity_hours = 8
         meals_added_today = False
         
+        weather_jobs = []
+        
+        # Convert every coordinate once; the loop below only does the distance arithmetic
+        current_point = _travel_point(current_location)
+        hotel_point = _travel_point(chosen_hotel['location']) if chosen_hotel and 'location' in chosen_hotel else None
+        # (spot, location or None, travel point) for each spot, so the loop reads each location once
+        spot_plan = []
         for spot in final_itinerary_spots:
+            spot_location = spot.get('location')
+            spot_point = _travel_point(spot_location) if spot_location is not None else None
+            spot_plan.append((spot, spot_location, spot_point))
+        
+        # Restaurants are cost-sorted: the cheapest is the dinner stop when a day runs late
+        dinner_spot = restaurants[0] if restaurants else None
+        
+        for spot, spot_location, spot_point in spot_plan:
+            spot_name = spot['name']
             spot_time = spot.get("avg_time", 2)
-            travel_to_spot = estimate_internal_travel_time(current_location, spot.get('location', current_location))
+            if spot_location is None:
+                spot_point = current_point  # No location: treat the spot as where we already are
+            travel_to_spot = _travel_time_between(current_point, spot_point)
             total_time_needed = travel_to_spot + spot_time
             
             # Check if we need to move to next day
@@ -461,8 +576,7 @@ def generate_itinerary(request):
                 current_day < duration):
                 
                 # Add dinner if we haven't added meals today and it's evening
-                if not meals_added_today and current_hour_float >= 19.0 and restaurants:
-                    dinner_spot = restaurants[0]
+                if not meals_added_today and current_hour_float >= 19.0 and dinner_spot:
                     day_wise_itinerary[f"Day {current_day}"].append({
                         "time": format_time_from_float(current_hour_float),
                         "activity": f"Dinner at {dinner_spot['name']}",
@@ -478,20 +592,25 @@ def generate_itinerary(request):
                 time_used_today = 0
                 meals_added_today = False
                 
-                if chosen_hotel:
-                    current_location = chosen_hotel.get('location', current_location)
+                if chosen_hotel and 'location' in chosen_hotel:
+                    current_location = chosen_hotel['location']
+                    current_point = hotel_point
                 
-                travel_to_spot = estimate_internal_travel_time(current_location, spot.get('location', current_location))
+                if spot_location is None:
+                    spot_point = current_point
+                travel_to_spot = _travel_time_between(current_point, spot_point)
             
             # Skip if we've run out of days
             if current_day > duration:
                 alternative_attractions.append(spot)
                 continue
             
+            day_activities = day_wise_itinerary[f"Day {current_day}"]
+            
             # Add meal breaks if appropriate time
             if not meals_added_today and 12 <= current_hour_float < 14 and restaurants:
                 lunch_spot = restaurants[current_day % len(restaurants)]
-                day_wise_itinerary[f"Day {current_day}"].append({
+                day_activities.append({
                     "time": format_time_from_float(current_hour_float),
                     "activity": f"Lunch at {lunch_spot['name']}",
                     "duration_hours": 1,
@@ -505,9 +624,9 @@ def generate_itinerary(request):
             
             # Add travel to spot
             if travel_to_spot > 0.1:  # Only if significant travel time
-                day_wise_itinerary[f"Day {current_day}"].append({
+                day_activities.append({
                     "time": format_time_from_float(current_hour_float),
-                    "activity": f"Travel to {spot['name']}",
+                    "activity": f"Travel to {spot_name}",
                     "duration_hours": travel_to_spot,
                     "type": "travel"
                 })
@@ -516,17 +635,15 @@ def generate_itinerary(request):
             
             # Add the main activity with weather info
             activity_date = start_date + timedelta(days=current_day - 1)
-            weather_cache_key = f"weather_{spot.get('location', {}).get('lat', 0)}_{spot.get('location', {}).get('lng', 0)}_{activity_date}"
-            weather_info = get_cached_or_fetch(
-                weather_cache_key, 
-                get_weather, 
-                spot.get('location', current_location), 
-                activity_date
-            )
-            
+            if spot_location is not None:
+                weather_location = spot_location
+                weather_cache_key = f"weather_{spot_location.get('lat', 0)}_{spot_location.get('lng', 0)}_{activity_date}"
+            else:
+                weather_location = current_location
+                weather_cache_key = f"weather_0_0_{activity_date}"
             activity_entry = {
                 "time": format_time_from_float(current_hour_float),
-                "activity": spot['name'],
+                "activity": spot_name,
                 "duration_hours": spot_time,
                 "type": spot.get('type', 'attraction'),
                 "cost": spot.get("estimated_cost", 0),
@@ -540,14 +657,32 @@ def generate_itinerary(request):
                 activity_entry["description"] = (activity_entry["description"] + 
                     " [Hidden Gem]").strip()
             
-            if weather_info:
-                activity_entry["weather"] = weather_info
+            # Weather is fetched for all activities together once the schedule is known
+            weather_jobs.append((
+                activity_entry, weather_cache_key, weather_location, activity_date
+            ))
             
-            day_wise_itinerary[f"Day {current_day}"].append(activity_entry)
+            day_activities.append(activity_entry)
             
             current_hour_float += spot_time
             time_used_today += spot_time
-            current_location = spot.get('location', current_location)
+            if spot_location is not None:
+                current_location = spot_location
+                current_point = spot_point
+        
+        # Look up the weather for every scheduled activity in one cache round trip,
+        # fetching the misses concurrently instead of one request per spot
+        if weather_jobs:
+            # First location seen per key, as the serial per-spot lookups cached it
+            # (spots without a location all share weather_0_0_<date>)
+            weather_requests = {}
+            for _, weather_cache_key, weather_location, activity_date in weather_jobs:
+                weather_requests.setdefault(weather_cache_key, (weather_location, activity_date))
+            weather_by_key = get_many_cached_or_fetch(weather_requests, get_weather)
+            for activity_entry, weather_cache_key, _, _ in weather_jobs:
+                weather_info = weather_by_key[weather_cache_key]
+                if weather_info:
+                    activity_entry["weather"] = weather_info
         
         # Add hotel stays for each night (except last day)
         if chosen_hotel:
@@ -568,30 +703,20 @@ def generate_itinerary(request):
                 "type": "travel"
             })
         
-        # Calculate final costs
-        meal_costs = sum(
-            activity.get("cost", 0) 
-            for day_activities in day_wise_itinerary.values()
-            for activity in day_activities
-            if activity.get("type") == "restaurant"
-        )
-        
-        activity_costs = sum(
-            activity.get("cost", 0)
-            for day_activities in day_wise_itinerary.values()
-            for activity in day_activities
-            if activity.get("type") not in ("restaurant", "hotel", "travel")
-        )
+        # Calculate final costs and count hidden gems in one pass over the schedule
+        meal_costs = activity_costs = hidden_gems_count = 0
+        for day_activities in day_wise_itinerary.values():
+            for activity in day_activities:
+                activity_type = activity.get("type")
+                if activity_type == "restaurant":
+                    meal_costs += activity.get("cost", 0)
+                elif activity_type not in ("hotel", "travel"):
+                    activity_costs += activity.get("cost", 0)
+                if activity.get("is_hidden_gem", False):
+                    hidden_gems_count += 1
         
         total_cost = hotel_cost_total + meal_costs + activity_costs
         
-        # Count hidden gems in final itinerary
-        hidden_gems_count = sum(
-            1 for day_activities in day_wise_itinerary.values()
-            for activity in day_activities
-            if activity.get("is_hidden_gem", False)
-        )
-        
         # Prepare response
         response_data = {
             "user_id": user_id,
@@ -633,17 +758,8 @@ def generate_itinerary(request):
             "generated_at": datetime.now().isoformat()
         }
         
-        # Save to MongoDB
-        try:
-            user_itinerary = UserItinerary(
-                user_id=user_id, 
-                itinerary_data=response_data
-            )
-            user_itinerary.save()
-            logger.info(f"Itinerary saved successfully for user {user_id}")
-        except Exception as e:
-            logger.error(f"Failed to save itinerary: {e}")
-            # Continue without failing the request
+        # Save to MongoDB in the background; the response doesn't wait for the write
+        _persist_pool.submit(save_itinerary, user_id, response_data)
         
         logger.info(f"Itinerary generated successfully: {len(final_itinerary_spots)} spots, ₹{total_cost}, {hidden_gems_count} hidden gems")
         return Response(response_data, status=status.HTTP_200_OK)
@@ -656,6 +772,8 @@ def generate_itinerary(request):
         )
 
 
+# get_user_itineraries, get_itinerary_detail and delete_itinerary are not
+# routed in api/urls.py yet; clients list trips through PastTrips
 @api_view(['GET'])
 @authentication_classes([JWTAuthentication])
 @permission_classes([IsUser])
@@ -669,25 +787,52 @@ def get_user_itineraries(request):
                 status=status.HTTP_401_UNAUTHORIZED
             )
         
-        itineraries = UserItinerary.objects(user_id=user_id).order_by('-created_at')
+        # Optional paging: ?limit=&offset= (limit capped at MAX_ITINERARY_PAGE_SIZE).
+        # Without limit every itinerary is returned, as before
+        try:
+            limit = request.query_params.get('limit')
+            limit = min(int(limit), MAX_ITINERARY_PAGE_SIZE) if limit is not None else None
+            offset = int(request.query_params.get('offset', 0))
+            if (limit is not None and limit < 1) or offset < 0:
+                raise ValueError
+        except ValueError:
+            return Response(
+                {"error": "limit must be a positive integer and offset a non-negative integer"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        # Only the summary is listed, so the day-wise schedule and alternatives stay in MongoDB
+        itineraries = UserItinerary.objects(user_id=user_id).order_by('-created_at').only(
+            'id', 'created_at', 'itinerary_data.summary'
+        ).as_pymongo()
+        paged = limit is not None or offset > 0
+        if paged:
+            total_count = itineraries.count()
+            itineraries = itineraries.skip(offset)
+            if limit is not None:
+                itineraries = itineraries.limit(limit)
         
         itinerary_list = []
         for itinerary in itineraries:
-            summary = itinerary.itinerary_data.get('summary', {})
+            summary = itinerary.get('itinerary_data', {}).get('summary', {})
+            created_at = itinerary.get('created_at')
             itinerary_list.append({
-                'id': str(itinerary.id),
+                'id': str(itinerary['_id']),
                 'destination': summary.get('destination', 'Unknown'),
                 'start_date': summary.get('start_date', ''),
                 'end_date': summary.get('end_date', ''),
                 'total_days': summary.get('total_days', 0),
                 'actual_cost': summary.get('actual_cost', 0),
                 'hidden_gems_count': summary.get('hidden_gems_count', 0),
-                'created_at': itinerary.created_at.isoformat() if itinerary.created_at else None
+                'created_at': created_at.isoformat() if created_at else None
             })
         
+        if not paged:
+            total_count = len(itinerary_list)
+        
         return Response({
             'itineraries': itinerary_list,
-            'total_count': len(itinerary_list)
+            'total_count': total_count
         }, status=status.HTTP_200_OK)
         
     except Exception as e:
@@ -751,6 +896,10 @@ def delete_itinerary(request, itinerary_id):
             )
         
         itinerary.delete()
+        UserProfile.objects(user_id=str(user_id), trip_count__exists=True).update_one(
+            dec__trip_count=1,
+            dec__trip_budget_sum=itinerary.itinerary_data.get("summary", {}).get("actual_cost", 0)
+        )
         
         return Response(
             {"message": "Itinerary deleted successfully"}, 
@@ -29,34 +29,36 @@ def get_hidden_spots(destination, interests):
         ]
     
     try:
-        # Live MongoDB query with enhanced filtering
-        all_spots = PointOfInterest.objects(destination=destination).all()
+        # Live MongoDB query: the "hidden" criteria and the interest match are
+        # evaluated by MongoDB so only matching spots come over the wire
+        query = {
+            "destination": destination,
+            "tags": {"$in": list(interests)},
+            "$or": [
+                {"tags": {"$in": ["hidden", "offbeat"]}},
+                {"name": {"$regex": "secret", "$options": "i"}},
+                {"estimated_cost": {"$lt": 200}},
+                {"popularity_score": {"$not": {"$gte": 3.0}}},
+            ],
+        }
+        all_spots = PointOfInterest.objects(__raw__=query).only(
+            "name", "location", "avg_time", "estimated_cost", "tags"
+        ).limit(10)
         hidden_spots = []
 
         for spot in all_spots:
-            # Enhanced criteria for "hidden" spots
-            is_hidden = (
-                "hidden" in spot.tags or 
-                "secret" in spot.name.lower() or 
-                "offbeat" in spot.tags or
-                spot.estimated_cost < 200 or
-                getattr(spot, 'popularity_score', 0) < 3.0
-            )
-            
-            # Check if spot matches user interests
-            if any(tag in interests for tag in spot.tags) and is_hidden:
-                hidden_spots.append({
-                    "name": spot.name,
-                    "location": {
-                        "lat": float(spot.location.get('lat', 10.0)), 
-                        "lng": float(spot.location.get('lng', 77.0))
-                    },
-                    "avg_time": spot.avg_time,
-                    "estimated_cost": spot.estimated_cost,
-                    "type": spot.tags[0] if spot.tags else "general",
-                    "description": getattr(spot, 'description', ''),
-                    "rating": getattr(spot, 'rating', 0)
-                })
+            hidden_spots.append({
+                "name": spot.name,
+                "location": {
+                    "lat": float(spot.location.get('lat', 10.0)), 
+                    "lng": float(spot.location.get('lng', 77.0))
+                },
+                "avg_time": spot.avg_time,
+                "estimated_cost": spot.estimated_cost,
+                "type": spot.tags[0] if spot.tags else "general",
+                "description": getattr(spot, 'description', ''),
+                "rating": getattr(spot, 'rating', 0)
+            })
 
         return hidden_spots[:10]  # Limit to top 10 hidden spots
         
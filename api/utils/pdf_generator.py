@@ -1,9 +1,13 @@
 from reportlab.lib.pagesizes import letter
 from reportlab.pdfgen import canvas
-from io import BytesIO
+from tempfile import SpooledTemporaryFile
 
-def generate_itinerary_pdf(itinerary_data):
-    buffer = BytesIO()
+# PDFs larger than this spill from memory to a temporary file
+PDF_SPOOL_MAX_SIZE = 1024 * 1024
+
+def generate_itinerary_pdf(itinerary_data, buffer=None):
+    if buffer is None:
+        buffer = SpooledTemporaryFile(max_size=PDF_SPOOL_MAX_SIZE)
     pdf = canvas.Canvas(buffer, pagesize=letter)
     width, height = letter
 
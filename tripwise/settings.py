@@ -119,11 +119,14 @@ DATABASES = {
     }
 }
 
-# MongoDB Connection
+# MongoDB Connection (the pool is shared with the GridFS helpers in api/user_backend.py)
 connect(
     db="tripwise_db",
     host=os.getenv("MONGODB_URI"),
-    alias="default"
+    alias="default",
+    maxPoolSize=50,
+    minPoolSize=5,
+    serverSelectionTimeoutMS=3000
 )
 
 